@@ -110,6 +110,13 @@ DATABASES = {
 STATIC_URL = 'static/'
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 
+# Response cache for the read-only loan endpoints; point CACHE_URL at
+# Redis in production (e.g. rediscache://localhost:6379/1), in-process
+# memory otherwise
+CACHES = {
+    'default': env.cache('CACHE_URL', default='locmemcache://'),
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
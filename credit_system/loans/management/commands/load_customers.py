@@ -1,8 +1,16 @@
 import os
 import pandas as pd
 from decimal import Decimal
+from celery import chord, group
 from django.core.management.base import BaseCommand
-from loans.tasks import load_customers_task
+from loans.models import DataIngestionLog
+from loans.tasks import (
+    count_data_rows,
+    finalize_ingest_log,
+    load_customers_chunk_task,
+    load_customers_task,
+    mark_ingest_log_failed,
+)
 
 class Command(BaseCommand):
     help = "Load customers from Excel into the database using background tasks"
@@ -19,11 +27,22 @@ class Command(BaseCommand):
             action='store_true',
             help='Run synchronously instead of as background task'
         )
+        parser.add_argument(
+            '--parallel',
+            action='store_true',
+            help='Split the file into chunks ingested by parallel Celery workers'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=10000,
+            help='Rows per chunk task when using --parallel'
+        )
 
     def handle(self, *args, **kwargs):
         file_path = kwargs['file']
         sync = kwargs['sync']
-        
+
         if sync:
             # Run synchronously for development/testing
             result = load_customers_task(file_path)
@@ -39,6 +58,34 @@ class Command(BaseCommand):
                 self.stdout.write(
                     self.style.ERROR(f"Failed to load customers: {result['message']}")
                 )
+        elif kwargs['parallel']:
+            # Dispatch one chunk task per slice of the file so workers
+            # ingest in parallel
+            chunk_size = kwargs['chunk_size']
+            total = count_data_rows(file_path)
+            log = DataIngestionLog.objects.create(
+                ingestion_type='CUSTOMER',
+                file_name=file_path,
+                status='STARTED',
+            )
+            header = group(
+                load_customers_chunk_task.s(file_path, start, chunk_size)
+                for start in range(0, total, chunk_size)
+            )
+            # The chord callback folds the per-chunk results into the
+            # shared log once every chunk task has finished; the errback
+            # marks the log FAILED if any chunk dies, so it can never be
+            # left in STARTED
+            callback = finalize_ingest_log.s(log.log_id).on_error(
+                mark_ingest_log_failed.s(log.log_id)
+            )
+            job = chord(header)(callback)
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"✅ Dispatched {(total + chunk_size - 1) // chunk_size} chunk tasks "
+                    f"for {total} rows (log ID: {log.log_id}, callback ID: {job.id})"
+                )
+            )
         else:
             # Run as background task
             task = load_customers_task.delay(file_path)
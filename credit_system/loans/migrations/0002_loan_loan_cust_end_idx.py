@@ -0,0 +1,17 @@
+# Generated by Django 5.2.17 on 2026-08-27 22:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('loans', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='loan',
+            index=models.Index(fields=['customer', 'end_date'], name='loan_cust_end_idx'),
+        ),
+    ]
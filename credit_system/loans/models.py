@@ -1,8 +1,13 @@
 from django.db import models
+from django.db.models import When
+from django.db.models.functions import ExtractMonth, ExtractYear, Greatest, Least
 from django.core.validators import MinValueValidator, MaxValueValidator
-from decimal import Decimal
+from decimal import Decimal, ROUND_HALF_UP
 from datetime import date
 
+# Shared quantum for rounding money values to two decimal places
+TWO_PLACES = Decimal('0.01')
+
 
 class Customer(models.Model):
     """
@@ -47,17 +52,50 @@ class Customer(models.Model):
         return f"{self.first_name} {self.last_name}".strip()
 
     def get_current_loans_sum(self):
-        active_loans = [loan for loan in self.loans.all() if loan.repayments_left > 0]
-        return sum(loan.loan_amount for loan in active_loans)
+        # "Current" means repayments_left > 0. The annotation is the
+        # exact SQL translation of that property — a loan also drops
+        # out once tenure months have elapsed, even if its end_date is
+        # still ahead — so the Python filter-and-sum collapses to one
+        # DB aggregate without changing which loans count
+        total = self.loans.with_repayments_left().filter(
+            repayments_left_db__gt=0
+        ).aggregate(total=models.Sum('loan_amount'))['total']
+        return total if total is not None else Decimal('0.00')
 
     def get_current_emis_sum(self):
-        active_loans = [loan for loan in self.loans.all() if loan.repayments_left > 0]
-        return sum(loan.monthly_repayment for loan in active_loans)
+        total = self.loans.with_repayments_left().filter(
+            repayments_left_db__gt=0
+        ).aggregate(total=models.Sum('monthly_repayment'))['total']
+        return total if total is not None else Decimal('0.00')
 
     def __str__(self):
         return f"Customer {self.customer_id}: {self.get_full_name()}"
 
 
+class LoanQuerySet(models.QuerySet):
+    def with_repayments_left(self, as_of=None):
+        """
+        Annotate each loan with `repayments_left_db`, the SQL
+        equivalent of the repayments_left property, so loops and
+        aggregates read it from the query instead of doing per-row
+        Python date math.
+        """
+        as_of = as_of or date.today()
+        months_passed = models.Value(as_of.year * 12 + as_of.month) - (
+            ExtractYear('start_date') * 12 + ExtractMonth('start_date')
+        )
+        return self.annotate(
+            repayments_left_db=models.Case(
+                When(end_date__lte=as_of, then=models.Value(0)),
+                default=Least(
+                    models.F('tenure'),
+                    Greatest(models.Value(0), models.F('tenure') - months_passed),
+                ),
+                output_field=models.IntegerField(),
+            )
+        )
+
+
 class Loan(models.Model):
     """
     Loan model to store loan information
@@ -91,11 +129,14 @@ class Loan(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = LoanQuerySet.as_manager()
+
     class Meta:
         db_table = 'loans'
         indexes = [
             models.Index(fields=['loan_id']),
             models.Index(fields=['customer', 'start_date']),
+            models.Index(fields=['customer', 'end_date'], name='loan_cust_end_idx'),
             models.Index(fields=['start_date', 'end_date']),
         ]
 
@@ -105,17 +146,12 @@ class Loan(models.Model):
         super().save(*args, **kwargs)
 
     def calculate_emi(self):
-        """Standard EMI formula"""
-        principal = float(self.loan_amount)
-        annual_rate = float(self.interest_rate)
-        n = self.tenure
-        r = annual_rate / (12 * 100)  # monthly rate
-
-        if r == 0:
-            return Decimal(str(principal / n))
+        """Standard EMI formula, via the shared float kernel"""
+        from loans.services.emi_kernels import emi_scalar
 
-        emi = (principal * r * (1 + r) ** n) / ((1 + r) ** n - 1)
-        return Decimal(str(round(emi, 2)))
+        emi = emi_scalar(float(self.loan_amount), float(self.interest_rate), self.tenure)
+        # Quantize directly instead of round() + str() + re-parse
+        return Decimal(emi).quantize(TWO_PLACES, rounding=ROUND_HALF_UP)
 
     @property
     def repayments_left(self):
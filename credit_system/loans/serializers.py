@@ -1,9 +1,5 @@
 from rest_framework import serializers
-from .models import Customer,Loan
-import math
-
-from rest_framework import serializers
-from .models import Customer
+from .models import Customer, Loan
 
 class CustomerRegisterSerializer(serializers.ModelSerializer):
     monthly_income = serializers.IntegerField(write_only=True)
@@ -1,44 +1,79 @@
 # loans/services/eligibility_service.py
 from decimal import Decimal
 from datetime import date
-from loans.models import Customer, Loan, LoanApplication, CreditScore
-
-def calculate_credit_score(customer: Customer) -> int:
+from django.db.models import Count, Q, Sum
+from loans.models import Customer, Loan, LoanApplication, CreditScore, TWO_PLACES
+from loans.services.emi_kernels import (
+    DECISION_APPROVED,
+    DECISION_HIGH_EMI,
+    DECISION_LOW_SCORE,
+    DECISION_OVER_LIMIT,
+    decide_eligibility,
+    emi_cached,
+    emi_scalar,
+)
+
+# Hoisted constants so hot paths don't re-parse a Decimal per call
+EMI_SALARY_CAP = Decimal("0.5")  # EMIs may use at most half the salary
+MEDIUM_SCORE_MIN_RATE = Decimal("12.0")
+MEDIUM_SCORE_CORRECTED_RATE = Decimal("12.1")
+LOW_SCORE_MIN_RATE = Decimal("16.0")
+LOW_SCORE_CORRECTED_RATE = Decimal("16.1")
+
+DECISION_MESSAGES = {
+    DECISION_APPROVED: "Loan approved",
+    DECISION_HIGH_EMI: "EMI exceeds 50% of monthly income",
+    DECISION_OVER_LIMIT: "Exceeds approved credit limit",
+    DECISION_LOW_SCORE: "Credit score too low",
+}
+
+def score_from_loan_stats(total, on_time, this_year, volume) -> int:
     """
-    Simplified credit score calculation (0–100).
-    Components:
-    - Past loans paid on time
-    - Number of loans taken
-    - Loan activity in current year
-    - Loan approved volume
+    Score (0–100) from pre-aggregated loan stats. Shared by the
+    per-customer path below and the batch recalculation task.
     """
-
-    loans = customer.loans.all()
-    if not loans.exists():
+    if not total:
         return 50  # neutral score for no history
 
     score = 0
 
     # i. Past loans paid on time (max 30 points)
-    on_time_ratio = sum(1 for loan in loans if loan.emis_paid_on_time > 0) / len(loans)
-    score += int(on_time_ratio * 30)
+    score += int(on_time / total * 30)
 
     # ii. Number of loans taken (max 20 points)
-    score += min(len(loans) * 5, 20)
+    score += min(total * 5, 20)
 
     # iii. Loan activity in current year (max 20 points)
-    current_year = date.today().year
-    loans_this_year = [loan for loan in loans if loan.start_date.year == current_year]
-    score += min(len(loans_this_year) * 5, 20)
+    score += min(this_year * 5, 20)
 
     # iv. Loan approved volume (max 20 points)
-    total_volume = sum(float(loan.loan_amount) for loan in loans)
-    score += min(int(total_volume / 100000), 20)  # 1 point per lakh
+    score += min(int(float(volume) / 100000), 20)  # 1 point per lakh
 
     # v. Cap score to 100
     return min(score, 100)
 
 
+def calculate_credit_score(customer: Customer) -> int:
+    """
+    Simplified credit score calculation (0–100).
+    Components:
+    - Past loans paid on time
+    - Number of loans taken
+    - Loan activity in current year
+    - Loan approved volume
+    """
+
+    # All four components come back in one conditional-aggregation
+    # query instead of fetching every loan and iterating it four times
+    agg = customer.loans.aggregate(
+        total=Count('pk'),
+        on_time=Count('pk', filter=Q(emis_paid_on_time__gt=0)),
+        this_year=Count('pk', filter=Q(start_date__year=date.today().year)),
+        volume=Sum('loan_amount'),
+    )
+    return score_from_loan_stats(agg['total'], agg['on_time'], agg['this_year'], agg['volume'])
+
+
 def evaluate_loan(customer: Customer, loan_amount: Decimal, interest_rate: Decimal, tenure: int):
     """
     Apply business rules to check loan eligibility
@@ -49,19 +84,12 @@ def evaluate_loan(customer: Customer, loan_amount: Decimal, interest_rate: Decim
     if customer.get_current_loans_sum() > customer.approved_limit:
         credit_score = 0
 
-    # EMI calculation
-    annual_rate = float(interest_rate)
-    n = tenure
-    r = annual_rate / (12 * 100)
-    principal = float(loan_amount)
-
-    if r == 0:
-        emi = Decimal(str(principal / n))
-    else:
-        emi = Decimal(str((principal * r * (1 + r) ** n) / ((1 + r) ** n - 1))).quantize(Decimal("0.01"))
+    # EMI calculation via the shared kernel; quantize the float
+    # directly instead of routing it through a string parse
+    emi = Decimal(emi_scalar(float(loan_amount), float(interest_rate), tenure)).quantize(TWO_PLACES)
 
     # Rule: if EMIs > 50% of salary → reject
-    if (customer.get_current_emis_sum() + emi) > (Decimal("0.5") * customer.monthly_salary):
+    if (customer.get_current_emis_sum() + emi) > (EMI_SALARY_CAP * customer.monthly_salary):
         return False, credit_score, interest_rate, None, emi
 
     # Rule: approve/reject based on score
@@ -71,12 +99,49 @@ def evaluate_loan(customer: Customer, loan_amount: Decimal, interest_rate: Decim
     if credit_score > 50:
         approved = True
     elif 30 < credit_score <= 50:
-        if interest_rate <= Decimal("12.0"):
-            corrected_interest_rate = Decimal("12.1")  # minimum allowed
+        if interest_rate <= MEDIUM_SCORE_MIN_RATE:
+            corrected_interest_rate = MEDIUM_SCORE_CORRECTED_RATE  # minimum allowed
     elif 10 < credit_score <= 30:
-        if interest_rate <= Decimal("16.0"):
-            corrected_interest_rate = Decimal("16.1")
+        if interest_rate <= LOW_SCORE_MIN_RATE:
+            corrected_interest_rate = LOW_SCORE_CORRECTED_RATE
     else:
         approved = False
 
     return approved, credit_score, interest_rate, corrected_interest_rate, emi
+
+
+def evaluate_loan_eligibility(customer, loan_amount, interest_rate, tenure):
+    """
+    Evaluate if the loan can be approved based on:
+    - Customer credit score
+    - EMI affordability
+    - Approved limit
+
+    Used by the create_loan endpoint; unlike evaluate_loan above it
+    reads the cached CreditScore row rather than re-scoring from loans.
+    """
+    # Fetch latest credit score — served from the Prefetch in
+    # create_loan when available, falling back to a query otherwise
+    current_scores = getattr(customer, 'current_credit_scores', None)
+    if current_scores is None:
+        credit_score_obj = customer.credit_scores.filter(is_current=True).first()
+    else:
+        credit_score_obj = current_scores[0] if current_scores else None
+    credit_score = credit_score_obj.score if credit_score_obj else 50  # default if not present
+
+    # Monthly EMI via the memoized kernel — repeat requests for common
+    # loan configurations skip the math. The EMI stays a float from
+    # here on; Django converts it once when it hits a DecimalField
+    emi = round(emi_cached(loan_amount, interest_rate, tenure), 2)
+
+    # Affordability, limit and score checks run in the pure decision
+    # kernel on plain floats; only the message mapping stays here
+    approved, code = decide_eligibility(
+        emi,
+        float(customer.monthly_salary),
+        float(customer.get_current_loans_sum()),
+        float(loan_amount),
+        float(customer.approved_limit),
+        credit_score,
+    )
+    return approved, DECISION_MESSAGES[code], emi, credit_score
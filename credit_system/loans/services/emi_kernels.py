@@ -0,0 +1,104 @@
+# loans/services/emi_kernels.py
+"""
+Pure EMI math shared by the eligibility paths, Loan.calculate_emi and
+the ingestion pipeline. Kept free of model and Decimal imports so the
+kernels work on plain floats (and arrays) and stay cheap to call.
+
+When numba is installed the scalar kernel is JIT-compiled with
+cache=True/fastmath=True; without it the plain-Python version is used.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # optional dependency
+    njit = None
+
+
+def emi_scalar(principal, annual_rate, n):
+    """
+    Standard EMI formula on floats, computing (1 + r)**n only once.
+    `annual_rate` is the percentage rate; `n` the tenure in months.
+    """
+    if n == 0:
+        return float('nan')
+    r = annual_rate / 1200.0
+    if r == 0.0:
+        return principal / n
+    c = (1.0 + r) ** n
+    return principal * r * c / (c - 1.0)
+
+
+if njit is not None:
+    emi_scalar = njit(cache=True, fastmath=True)(emi_scalar)
+
+
+@lru_cache(maxsize=4096)
+def _emi_from_ints(principal_cents, rate_bps, n):
+    return emi_scalar(principal_cents / 100.0, rate_bps / 10000.0, n)
+
+
+def emi_cached(principal, annual_rate, n):
+    """
+    Memoized emi_scalar for the request hot path: inputs are quantized
+    to integer cents / basis points so common loan configurations hash
+    cleanly and repeat requests skip the math entirely.
+    """
+    return _emi_from_ints(
+        int(round(float(principal) * 100)),
+        int(round(float(annual_rate) * 10000)),
+        int(n),
+    )
+
+
+# Decision thresholds, named at module scope like the rate constants
+# in eligibility_service (numba folds globals into the compiled kernel)
+EMI_SALARY_CAP = 0.5
+MIN_CREDIT_SCORE = 50
+
+# Decision codes returned by decide_eligibility; the caller maps them
+# to response messages
+DECISION_APPROVED = 0
+DECISION_HIGH_EMI = 1
+DECISION_OVER_LIMIT = 2
+DECISION_LOW_SCORE = 3
+
+
+def decide_eligibility(emi, salary, current_loans_sum, principal, approved_limit, credit_score):
+    """
+    Pure numeric eligibility decision: affordability, limit and score
+    checks on plain floats/ints, in rule order. Returns
+    (approved, decision_code) with no model or string work, so it is
+    JIT-compilable alongside the EMI kernels.
+    """
+    if emi > salary * EMI_SALARY_CAP:
+        return False, DECISION_HIGH_EMI
+    if current_loans_sum + principal > approved_limit:
+        return False, DECISION_OVER_LIMIT
+    if credit_score < MIN_CREDIT_SCORE:
+        return False, DECISION_LOW_SCORE
+    return True, DECISION_APPROVED
+
+
+if njit is not None:
+    decide_eligibility = njit(cache=True, fastmath=True)(decide_eligibility)
+
+
+def emi_array(principal, annual_rate, n):
+    """
+    Vectorized emi_scalar: one broadcast NumPy pass over aligned arrays
+    instead of a Python-level call per row. NaN where n == 0.
+    """
+    principal = np.asarray(principal, dtype=float)
+    r = np.asarray(annual_rate, dtype=float) / 1200.0
+    n = np.asarray(n)
+    c = (1.0 + r) ** n
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(
+            n == 0,
+            np.nan,
+            np.where(r == 0.0, principal / n, principal * r * c / (c - 1.0)),
+        )
@@ -0,0 +1,112 @@
+# tests.py
+import math
+
+from django.test import SimpleTestCase
+from loans.services.emi_kernels import (
+    DECISION_APPROVED,
+    DECISION_HIGH_EMI,
+    DECISION_LOW_SCORE,
+    DECISION_OVER_LIMIT,
+    decide_eligibility,
+    emi_array,
+    emi_cached,
+    emi_scalar,
+)
+from loans.services.eligibility_service import DECISION_MESSAGES
+
+
+def reference_emi(principal, annual_rate, n):
+    # The textbook formula the kernels replaced: P*r*(1+r)^n / ((1+r)^n - 1)
+    r = annual_rate / 1200.0
+    return principal * r * (1 + r) ** n / ((1 + r) ** n - 1)
+
+
+class EmiKernelTest(SimpleTestCase):
+    CASES = [
+        (100000.0, 10.5, 12),
+        (500000.0, 16.0, 36),
+        (250000.0, 8.25, 60),
+        (1.0, 12.0, 1),
+    ]
+
+    def test_emi_scalar_matches_reference_formula(self):
+        for principal, rate, n in self.CASES:
+            self.assertAlmostEqual(
+                emi_scalar(principal, rate, n),
+                reference_emi(principal, rate, n),
+                places=6,
+            )
+
+    def test_emi_scalar_zero_rate_is_straight_line(self):
+        self.assertAlmostEqual(emi_scalar(240000.0, 0.0, 24), 10000.0)
+
+    def test_emi_scalar_zero_tenure_is_nan(self):
+        self.assertTrue(math.isnan(emi_scalar(100000.0, 10.0, 0)))
+
+    def test_emi_array_matches_scalar_elementwise(self):
+        principals = [p for p, _, _ in self.CASES] + [240000.0, 100000.0]
+        rates = [r for _, r, _ in self.CASES] + [0.0, 10.0]
+        tenures = [n for _, _, n in self.CASES] + [24, 0]
+        result = emi_array(principals, rates, tenures)
+        for got, principal, rate, n in zip(result, principals, rates, tenures):
+            expected = emi_scalar(principal, rate, n)
+            if math.isnan(expected):
+                self.assertTrue(math.isnan(got))
+            else:
+                self.assertAlmostEqual(float(got), expected, places=6)
+
+    def test_emi_cached_matches_scalar(self):
+        for principal, rate, n in self.CASES:
+            self.assertAlmostEqual(
+                emi_cached(principal, rate, n),
+                emi_scalar(principal, rate, n),
+                places=6,
+            )
+        # Repeat call (the cache hit) returns the same value
+        self.assertEqual(
+            emi_cached(100000.0, 10.5, 12), emi_cached(100000.0, 10.5, 12)
+        )
+
+
+class DecideEligibilityTest(SimpleTestCase):
+    # (emi, salary, current_loans_sum, principal, approved_limit, score)
+    BASE = dict(
+        emi=10000.0,
+        salary=50000.0,
+        current_loans_sum=0.0,
+        principal=100000.0,
+        approved_limit=1800000.0,
+        credit_score=80,
+    )
+
+    def decide(self, **overrides):
+        args = {**self.BASE, **overrides}
+        return decide_eligibility(
+            args['emi'], args['salary'], args['current_loans_sum'],
+            args['principal'], args['approved_limit'], args['credit_score'],
+        )
+
+    def test_approved(self):
+        self.assertEqual(self.decide(), (True, DECISION_APPROVED))
+
+    def test_emi_over_half_salary_rejects(self):
+        self.assertEqual(
+            self.decide(emi=26000.0), (False, DECISION_HIGH_EMI)
+        )
+
+    def test_over_approved_limit_rejects(self):
+        self.assertEqual(
+            self.decide(current_loans_sum=1750000.0),
+            (False, DECISION_OVER_LIMIT),
+        )
+
+    def test_low_credit_score_rejects(self):
+        self.assertEqual(
+            self.decide(credit_score=40), (False, DECISION_LOW_SCORE)
+        )
+
+    def test_every_code_has_a_message(self):
+        for code in (DECISION_APPROVED, DECISION_HIGH_EMI,
+                     DECISION_OVER_LIMIT, DECISION_LOW_SCORE):
+            self.assertIn(code, DECISION_MESSAGES)
+        self.assertEqual(DECISION_MESSAGES[DECISION_APPROVED], "Loan approved")
@@ -0,0 +1,99 @@
+# tests.py
+import os
+import tempfile
+from datetime import date, timedelta
+
+import pandas as pd
+from django.test import TestCase
+from loans.models import Customer, DataIngestionLog, Loan
+from loans.tasks import load_customers_task, load_loans_task
+
+
+class SyncIngestionRoundTripTest(TestCase):
+    """
+    End-to-end run of the ingestion tasks called synchronously (as
+    `manage.py load_customers --sync` does), against Excel files built
+    on the fly. The Parquet sidecar lands next to the source file, so
+    the temp directory cleans it up too.
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def write_customers(self, filename='customer_data.xlsx'):
+        path = os.path.join(self.tmpdir.name, filename)
+        pd.DataFrame({
+            'Customer ID': [1, 2, 3, 4],
+            'First Name': ['A', 'B', 'C', 'D'],
+            'Last Name': ['X', 'Y', 'Z', 'W'],
+            'Age': [30, 40, 50, 60],
+            # Row 4 has a blank phone number and must be routed to
+            # errors instead of aborting the file
+            'Phone Number': [9000000001, 9000000002, 9000000003, None],
+            'Monthly Salary': [50000, 60000, 70000, 80000],
+            'Approved Limit': [1800000, 2200000, 2500000, 2900000],
+            'Current Debt': [0, 0, 0, 0],
+        }).to_excel(path, index=False)
+        return path
+
+    def write_loans(self, filename='loan_data.xlsx'):
+        path = os.path.join(self.tmpdir.name, filename)
+        today = date.today()
+        start = (today - timedelta(days=100)).isoformat()
+        end = (today + timedelta(days=600)).isoformat()
+        pd.DataFrame({
+            # Customer 99 does not exist and must be skipped with an error
+            'Customer ID': [1, 1, 2, 99],
+            'Loan ID': [101, 102, 103, 104],
+            'Loan Amount': [100000, 200000, 300000, 400000],
+            'Tenure': [12, 24, 36, 12],
+            'Interest Rate': [10.5, 0, 12.25, 9],
+            # Blank payments fall back to the computed EMI
+            'Monthly Payment': [8800.0, None, None, 1000.0],
+            'EMIs Paid On Time': [5, 3, 1, 0],
+            'Date of Approval': [start, start, start, start],
+            'End Date': [end, end, end, end],
+        }).to_excel(path, index=False)
+        return path
+
+    def test_round_trip(self):
+        customers_path = self.write_customers()
+        result = load_customers_task(customers_path)
+        self.assertEqual(result['status'], 'success')
+        self.assertEqual(result['created'], 3)
+        self.assertEqual(result['errors'], 1)
+        self.assertEqual(Customer.objects.count(), 3)
+
+        # Re-running the same file skips every existing phone number
+        rerun = load_customers_task(customers_path)
+        self.assertEqual(rerun['created'], 0)
+        self.assertEqual(rerun['skipped'], 3)
+        self.assertEqual(Customer.objects.count(), 3)
+
+        loans_path = self.write_loans()
+        result = load_loans_task(loans_path)
+        self.assertEqual(result['status'], 'success')
+        self.assertEqual(result['loans_created'], 3)
+        self.assertEqual(result['skipped'], 1)
+        self.assertEqual(Loan.objects.count(), 3)
+
+        # Blank Monthly Payment fell back to the EMI formula
+        zero_rate = Loan.objects.get(loan_id=102)
+        self.assertAlmostEqual(
+            float(zero_rate.monthly_repayment), 200000 / 24, places=2
+        )
+
+        # current_debt was recomputed from the active loans per customer
+        c1 = Customer.objects.get(phone_number=9000000001)
+        self.assertEqual(float(c1.current_debt), 300000.0)
+
+        # Re-running the loan file skips the existing loan IDs
+        rerun = load_loans_task(loans_path)
+        self.assertEqual(rerun['loans_created'], 0)
+        self.assertEqual(Loan.objects.count(), 3)
+
+        # Every run left a completed ingestion log behind
+        self.assertEqual(
+            DataIngestionLog.objects.filter(status='COMPLETED').count(), 4
+        )
@@ -0,0 +1,87 @@
+# tests.py
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.test import TestCase
+from loans.models import Customer, Loan
+
+
+class RepaymentsLeftAnnotationTest(TestCase):
+    """
+    The repayments_left_db annotation must agree with the
+    repayments_left Python property for every loan shape the property
+    handles: already ended, not yet started, and mid-term.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        today = date.today()
+        cls.customer = Customer.objects.create(
+            first_name="Alice",
+            last_name="Smith",
+            age=30,
+            phone_number=9876543210,
+            monthly_salary=Decimal('50000'),
+            approved_limit=Decimal('1000000'),
+        )
+
+        def make_loan(tenure, start_date, end_date):
+            return Loan.objects.create(
+                customer=cls.customer,
+                loan_amount=Decimal('100000'),
+                tenure=tenure,
+                interest_rate=Decimal('10.0'),
+                monthly_repayment=Decimal('8800'),
+                start_date=start_date,
+                end_date=end_date,
+            )
+
+        # Ended loan: end_date in the past → 0 repayments left
+        make_loan(12, today - timedelta(days=400), today - timedelta(days=35))
+        # Future loan: start_date ahead → full tenure left
+        make_loan(24, today + timedelta(days=60), today + timedelta(days=790))
+        # Mid-term loan: started some months ago, still running
+        make_loan(36, today - timedelta(days=200), today + timedelta(days=880))
+        # Loan starting this month: no full month passed yet
+        make_loan(6, today, today + timedelta(days=180))
+
+    def test_annotation_matches_property(self):
+        for loan in Loan.objects.with_repayments_left():
+            self.assertEqual(
+                loan.repayments_left_db,
+                loan.repayments_left,
+                f"loan {loan.loan_id} ({loan.start_date}..{loan.end_date})",
+            )
+
+    def test_ended_loan_is_zero(self):
+        ended = Loan.objects.with_repayments_left().get(
+            end_date__lt=date.today()
+        )
+        self.assertEqual(ended.repayments_left_db, 0)
+
+    def test_future_loan_keeps_full_tenure(self):
+        future = Loan.objects.with_repayments_left().get(
+            start_date__gt=date.today()
+        )
+        self.assertEqual(future.repayments_left_db, future.tenure)
+
+    def test_current_sums_follow_repayments_left(self):
+        # A loan whose tenure months have elapsed but whose end_date is
+        # still ahead has repayments_left == 0 and must not count
+        # towards the customer's current loan/EMI sums
+        today = date.today()
+        stale = Loan.objects.create(
+            customer=self.customer,
+            loan_amount=Decimal('999999'),
+            tenure=3,
+            interest_rate=Decimal('10.0'),
+            monthly_repayment=Decimal('8800'),
+            start_date=today - timedelta(days=200),
+            end_date=today + timedelta(days=30),
+        )
+        self.assertEqual(stale.repayments_left, 0)
+        expected = sum(
+            loan.loan_amount for loan in self.customer.loans.all()
+            if loan.repayments_left > 0
+        )
+        self.assertEqual(self.customer.get_current_loans_sum(), expected)
@@ -8,11 +8,13 @@ from django.urls import reverse
 
 
 class ViewLoanAPITest(TestCase):
-    def setUp(self):
-        self.client = APIClient()
+    @classmethod
+    def setUpTestData(cls):
+        # Created once per class and rolled back per test, instead of
+        # re-inserting the same fixtures before every test method
 
         # Customer
-        self.customer = Customer.objects.create(
+        cls.customer = Customer.objects.create(
             first_name="Alice",
             last_name="Smith",
             age=30,
@@ -22,8 +24,8 @@ class ViewLoanAPITest(TestCase):
         )
 
         # Loan
-        self.loan = Loan.objects.create(
-            customer=self.customer,
+        cls.loan = Loan.objects.create(
+            customer=cls.customer,
             loan_amount=Decimal('500000'),
             tenure=12,
             interest_rate=Decimal('12.0'),
@@ -34,17 +36,20 @@ class ViewLoanAPITest(TestCase):
 
         # LoanApplication approved
         LoanApplication.objects.create(
-            customer=self.customer,
-            loan=self.loan,
-            requested_amount=self.loan.loan_amount,
-            requested_interest_rate=self.loan.interest_rate,
-            requested_tenure=self.loan.tenure,
+            customer=cls.customer,
+            loan=cls.loan,
+            requested_amount=cls.loan.loan_amount,
+            requested_interest_rate=cls.loan.interest_rate,
+            requested_tenure=cls.loan.tenure,
             status='APPROVED',
-            approved_amount=self.loan.loan_amount,
-            approved_interest_rate=self.loan.interest_rate,
-            monthly_installment=self.loan.monthly_repayment
+            approved_amount=cls.loan.loan_amount,
+            approved_interest_rate=cls.loan.interest_rate,
+            monthly_installment=cls.loan.monthly_repayment
         )
 
+    def setUp(self):
+        self.client = APIClient()
+
     def test_view_loan_success(self):
         response = self.client.get(f'/api/view-loan/{self.loan.loan_id}/')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
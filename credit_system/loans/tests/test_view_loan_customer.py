@@ -7,11 +7,13 @@ from decimal import Decimal
 from datetime import date, timedelta
 
 class ViewLoansByCustomerAPITest(TestCase):
-    def setUp(self):
-        self.client = APIClient()
+    @classmethod
+    def setUpTestData(cls):
+        # Created once per class and rolled back per test, instead of
+        # re-inserting the same fixtures before every test method
 
         # Customer
-        self.customer = Customer.objects.create(
+        cls.customer = Customer.objects.create(
             first_name="Alice",
             last_name="Smith",
             age=30,
@@ -21,8 +23,8 @@ class ViewLoansByCustomerAPITest(TestCase):
         )
 
         # Loan 1 (approved)
-        self.loan1 = Loan.objects.create(
-            customer=self.customer,
+        cls.loan1 = Loan.objects.create(
+            customer=cls.customer,
             loan_amount=Decimal('500000'),
             tenure=12,
             interest_rate=Decimal('12.0'),
@@ -30,21 +32,21 @@ class ViewLoansByCustomerAPITest(TestCase):
             start_date=date.today() - timedelta(days=30),
             end_date=date.today() + timedelta(days=335)
         )
-        self.application1 = LoanApplication.objects.create(
-            customer=self.customer,
-            loan=self.loan1,
-            requested_amount=self.loan1.loan_amount,
-            requested_interest_rate=self.loan1.interest_rate,
-            requested_tenure=self.loan1.tenure,
+        cls.application1 = LoanApplication.objects.create(
+            customer=cls.customer,
+            loan=cls.loan1,
+            requested_amount=cls.loan1.loan_amount,
+            requested_interest_rate=cls.loan1.interest_rate,
+            requested_tenure=cls.loan1.tenure,
             status='APPROVED',
-            approved_amount=self.loan1.loan_amount,
-            approved_interest_rate=self.loan1.interest_rate,
-            monthly_installment=self.loan1.monthly_repayment
+            approved_amount=cls.loan1.loan_amount,
+            approved_interest_rate=cls.loan1.interest_rate,
+            monthly_installment=cls.loan1.monthly_repayment
         )
 
         # Loan 2 (not approved)
-        self.loan2 = Loan.objects.create(
-            customer=self.customer,
+        cls.loan2 = Loan.objects.create(
+            customer=cls.customer,
             loan_amount=Decimal('200000'),
             tenure=6,
             interest_rate=Decimal('10.0'),
@@ -54,6 +56,9 @@ class ViewLoansByCustomerAPITest(TestCase):
         )
         # No application → not approved
 
+    def setUp(self):
+        self.client = APIClient()
+
     def test_view_loans_success(self):
         url = f'/api/view-loans/{self.customer.customer_id}/'
         response = self.client.get(url)
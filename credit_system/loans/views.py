@@ -3,6 +3,12 @@ from rest_framework.response import Response
 from rest_framework import status
 from decimal import Decimal
 from datetime import date, timedelta
+from django.core.cache import cache
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+from django.db import transaction
+from django.db.models import BooleanField, ExpressionWrapper, FloatField, Prefetch, Q
+from django.db.models.functions import Cast
 from django.utils import timezone
 from loans.models import Customer, Loan, LoanApplication, CreditScore
 from .serializers import (
@@ -13,8 +19,8 @@ from .serializers import (
     CreateLoanRequestSerializer,
     CreateLoanResponseSerializer
 )
-from .services.eligibility_service import evaluate_loan
-from .tasks import load_customers_task, load_loans_task
+from .services.eligibility_service import evaluate_loan, evaluate_loan_eligibility
+from .tasks import create_loan_writes_task, load_customers_task, load_loans_task
 import logging
 
 logger = logging.getLogger(__name__)
@@ -74,41 +80,6 @@ def check_eligibility(request):
     
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-def evaluate_loan_eligibility(customer, loan_amount, interest_rate, tenure):
-    """
-    Evaluate if the loan can be approved based on:
-    - Customer credit score
-    - EMI affordability
-    - Approved limit
-    """
-    # Fetch latest credit score
-    credit_score_obj = customer.credit_scores.filter(is_current=True).first()
-    credit_score = credit_score_obj.score if credit_score_obj else 50  # default if not present
-
-    # Calculate monthly EMI
-    principal = float(loan_amount)
-    r = float(interest_rate) / (12 * 100)
-    n = tenure
-    
-    if r == 0:
-        emi = principal / n
-    else:
-        emi = (principal * r * (1 + r) ** n) / ((1 + r) ** n - 1)
-
-    # Check EMI affordability (<=50% of salary)
-    if emi > float(customer.monthly_salary) * 0.5:
-        return False, "EMI exceeds 50% of monthly income", Decimal(str(emi)), credit_score
-
-    # Check approved credit limit
-    if (customer.get_current_loans_sum() + loan_amount) > customer.approved_limit:
-        return False, "Exceeds approved credit limit", Decimal(str(emi)), credit_score
-
-    # Check minimal credit score threshold
-    if credit_score < 50:
-        return False, "Credit score too low", Decimal(str(emi)), credit_score
-
-    return True, "Loan approved", Decimal(str(round(emi, 2))), credit_score
-
 @api_view(["POST"])
 def create_loan(request):
     """
@@ -122,7 +93,18 @@ def create_loan(request):
     data = serializer.validated_data
     
     try:
-        customer = Customer.objects.get(customer_id=data["customer_id"])
+        # Bring the current credit score along on the customer fetch so
+        # the eligibility check below costs no extra SELECT, and fetch
+        # only the columns the eligibility rules actually read
+        customer = Customer.objects.only(
+            'customer_id', 'monthly_salary', 'approved_limit'
+        ).prefetch_related(
+            Prefetch(
+                'credit_scores',
+                queryset=CreditScore.objects.filter(is_current=True),
+                to_attr='current_credit_scores',
+            )
+        ).get(customer_id=data["customer_id"])
     except Customer.DoesNotExist:
         return Response({"error": "Customer not found"}, status=status.HTTP_404_NOT_FOUND)
 
@@ -134,40 +116,59 @@ def create_loan(request):
         customer, loan_amount, interest_rate, tenure
     )
 
-    # Create LoanApplication
-    application = LoanApplication.objects.create(
-        customer=customer,
-        requested_amount=loan_amount,
-        requested_interest_rate=interest_rate,
-        requested_tenure=tenure,
-        status='APPROVED' if approved else 'REJECTED',
-        monthly_installment=emi,
-        credit_score_at_application=credit_score,
-        rejection_message=None if approved else message,
-        processed_at=timezone.now()
-    )
+    # Opt-in async mode: the caller gets the eligibility decision
+    # immediately and a worker does the writes; mirrors the ingest-*
+    # endpoints. The default stays synchronous
+    if request.data.get('async'):
+        task = create_loan_writes_task.delay(
+            customer.customer_id, float(loan_amount), float(interest_rate),
+            tenure, emi, credit_score, approved, message,
+        )
+        return Response({
+            "task_id": task.id,
+            "loan_id": None,
+            "customer_id": customer.customer_id,
+            "loan_approved": approved,
+            "message": message,
+            "monthly_installment": emi,
+        }, status=status.HTTP_202_ACCEPTED)
 
+    # One transaction (one commit fsync) for the whole write path, and
+    # one INSERT per row: the loan is created first so the application
+    # INSERT can carry the approval fields instead of needing a second
+    # save() round-trip
+    loan = None
     loan_id = None
-    if approved:
-        start_date = date.today()
-        end_date = start_date + timedelta(days=30 * tenure)
-        
-        loan = Loan.objects.create(
+    with transaction.atomic():
+        if approved:
+            start_date = date.today()
+            end_date = start_date + timedelta(days=30 * tenure)
+
+            loan = Loan.objects.create(
+                customer=customer,
+                loan_amount=loan_amount,
+                interest_rate=interest_rate,
+                tenure=tenure,
+                start_date=start_date,
+                end_date=end_date,
+                monthly_repayment=emi
+            )
+            loan_id = loan.loan_id
+
+        LoanApplication.objects.create(
             customer=customer,
-            loan_amount=loan_amount,
-            interest_rate=interest_rate,
-            tenure=tenure,
-            start_date=start_date,
-            end_date=end_date,
-            monthly_repayment=emi
+            loan=loan,
+            requested_amount=loan_amount,
+            requested_interest_rate=interest_rate,
+            requested_tenure=tenure,
+            status='APPROVED' if approved else 'REJECTED',
+            approved_amount=loan_amount if approved else None,
+            approved_interest_rate=interest_rate if approved else None,
+            monthly_installment=emi,
+            credit_score_at_application=credit_score,
+            rejection_message=None if approved else message,
+            processed_at=timezone.now()
         )
-        
-        application.loan = loan
-        application.approved_amount = loan_amount
-        application.approved_interest_rate = interest_rate
-        application.save()
-        
-        loan_id = loan.loan_id
 
     # Response format as per assignment specification
     response_data = {
@@ -175,27 +176,48 @@ def create_loan(request):
         "customer_id": customer.customer_id,
         "loan_approved": approved,
         "message": message,
-        "monthly_installment": float(emi)
+        "monthly_installment": emi  # already a float
     }
     
     response_serializer = CreateLoanResponseSerializer(response_data)
     return Response(response_serializer.data, status=status.HTTP_200_OK)
 
-@api_view(["GET"])
+@require_GET
 def view_loan(request, loan_id):
     """
     API endpoint to view a specific loan
     Expected response format as per assignment
+
+    Served as a plain Django view: these read-only endpoints return
+    pre-built dicts, so DRF's content negotiation and renderer machinery
+    is pure overhead here.
     """
     try:
-        loan = Loan.objects.get(loan_id=loan_id)
+        # Cheap single-column fetch first: the updated_at timestamp
+        # versions the cache key, so a stale entry can never be served
+        # and edits need no explicit invalidation
+        updated_at = Loan.objects.values_list('updated_at', flat=True).get(loan_id=loan_id)
     except Loan.DoesNotExist:
-        return Response({"error": "Loan not found"}, status=status.HTTP_404_NOT_FOUND)
+        return JsonResponse({"error": "Loan not found"}, status=404)
 
-    # Check if the loan has an approved application
-    loan_approved = False
-    if hasattr(loan, 'application') and loan.application.status == "APPROVED":
-        loan_approved = True
+    cache_key = f"loan:v1:{loan_id}:{updated_at.timestamp()}"
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return JsonResponse(cached)
+
+    # One JOINed query for the loan and its customer, trimmed to the
+    # columns the response serializes; the approval flag is computed in
+    # SQL from the application join instead of probing the reverse
+    # OneToOne per row
+    loan = Loan.objects.select_related('customer').only(
+        'loan_id', 'loan_amount', 'interest_rate', 'monthly_repayment', 'tenure',
+        'customer__customer_id', 'customer__first_name', 'customer__last_name',
+        'customer__phone_number', 'customer__age',
+    ).annotate(
+        loan_approved=ExpressionWrapper(
+            Q(application__status="APPROVED"), output_field=BooleanField()
+        ),
+    ).get(loan_id=loan_id)
 
     response_data = {
         "loan_id": loan.loan_id,
@@ -208,14 +230,15 @@ def view_loan(request, loan_id):
         },
         "loan_amount": float(loan.loan_amount),
         "interest_rate": float(loan.interest_rate),
-        "loan_approved": loan_approved,
+        "loan_approved": bool(loan.loan_approved),
         "monthly_installment": float(loan.monthly_repayment),
         "tenure": loan.tenure
     }
-    
-    return Response(response_data, status=status.HTTP_200_OK)
+    cache.set(cache_key, response_data, timeout=300)
+
+    return JsonResponse(response_data)
 
-@api_view(["GET"])
+@require_GET
 def view_loans(request, customer_id):
     """
     API endpoint to view all loans for a customer
@@ -224,26 +247,40 @@ def view_loans(request, customer_id):
     try:
         customer = Customer.objects.get(customer_id=customer_id)
     except Customer.DoesNotExist:
-        return Response({"error": "Customer not found"}, status=status.HTTP_404_NOT_FOUND)
+        return JsonResponse({"error": "Customer not found"}, status=404)
 
-    loans = customer.loans.all()  # Related name from Loan model: loans
-    response_data = []
-    
-    for loan in loans:
-        loan_approved = False
-        if hasattr(loan, 'application') and loan.application.status == "APPROVED":
-            loan_approved = True
-            
-        response_data.append({
-            "loan_id": loan.loan_id,
-            "loan_amount": float(loan.loan_amount),
-            "loan_approved": loan_approved,
-            "interest_rate": float(loan.interest_rate),
-            "monthly_installment": float(loan.monthly_repayment),
-            "repayments_left": loan.repayments_left
-        })
-    
-    return Response(response_data, status=status.HTTP_200_OK)
+    # Everything the response needs comes out of one JOINed query:
+    # the approval flag from the application join, repayments_left from
+    # the queryset annotation rather than per-row Python date math, and
+    # the Cast annotations make the DB hand back doubles so the loop
+    # skips three Decimal->float conversions per row. values() skips
+    # Loan instantiation entirely and iterator() keeps memory bounded
+    # for customers with many loans
+    rows = customer.loans.with_repayments_left().annotate(
+        loan_amount_f=Cast('loan_amount', FloatField()),
+        interest_rate_f=Cast('interest_rate', FloatField()),
+        monthly_repayment_f=Cast('monthly_repayment', FloatField()),
+        loan_approved=ExpressionWrapper(
+            Q(application__status="APPROVED"), output_field=BooleanField()
+        ),
+    ).values(
+        'loan_id', 'loan_amount_f', 'interest_rate_f',
+        'monthly_repayment_f', 'loan_approved', 'repayments_left_db',
+    ).iterator(chunk_size=500)
+
+    response_data = [
+        {
+            "loan_id": row['loan_id'],
+            "loan_amount": row['loan_amount_f'],
+            "loan_approved": bool(row['loan_approved']),
+            "interest_rate": row['interest_rate_f'],
+            "monthly_installment": row['monthly_repayment_f'],
+            "repayments_left": row['repayments_left_db'],
+        }
+        for row in rows
+    ]
+
+    return JsonResponse(response_data, safe=False)
 
 # Background task endpoints
 @api_view(['POST'])